@@ -0,0 +1,136 @@
+"""
+Helpers shared by the Bayesian network modules.
+
+rebonato_denev_eurozone_crisis and trump_tariffs_2025_blackswan both import
+the optional numba decorators, the einsum subscript alphabet and the
+junction tree used for exact inference from here.
+"""
+
+import numpy as np
+import networkx as nx
+from typing import Dict, List, Tuple
+from itertools import combinations
+
+try:
+    from numba import njit, prange
+    GOT_NUMBA = True
+except ImportError:
+    GOT_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Subscript alphabet for einsum-based inference (one letter per node)
+EINSUM_LABELS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def fill_in(graph: nx.Graph, node: str) -> int:
+    """Number of edges needed to make the neighbours of node a clique."""
+    return sum(1 for u, v in combinations(graph[node], 2) if not graph.has_edge(u, v))
+
+
+class JunctionTree:
+    """
+    Junction tree of a discrete Bayesian network, for exact inference.
+    
+    Built as in gRain's compile(): the moral graph is triangulated by
+    eliminating nodes in min-fill order (ties broken by topological
+    position, so the cliques come out in the same order on every run), the
+    maximal elimination cliques are joined by a maximum spanning tree over
+    separator sizes, and each CPD is multiplied into the smallest clique
+    holding its family.
+    """
+    
+    def __init__(self, graph: nx.DiGraph, cpds: Dict[str, dict], states: Dict[str, List[str]],
+                 topo_pos: Dict[str, int], dtype=np.float64):
+        if len(graph) > len(EINSUM_LABELS):
+            raise ValueError(f"einsum inference supports at most {len(EINSUM_LABELS)} nodes")
+        self.labels = {node: EINSUM_LABELS[i] for node, i in topo_pos.items()}
+        self.n_states = {node: len(states[node]) for node in graph}
+        self._einsum_paths = {}  # Cached contraction orders, keyed by einsum expression
+        
+        moral = nx.moral_graph(graph)
+        candidates = []
+        while moral:
+            node = min(moral, key=lambda n: (fill_in(moral, n), moral.degree(n), topo_pos[n]))
+            neighbours = list(moral[node])
+            moral.add_edges_from(combinations(neighbours, 2))
+            candidates.append(frozenset([node, *neighbours]))
+            moral.remove_node(node)
+        self.cliques = [tuple(sorted(c, key=topo_pos.get)) for c in candidates
+                        if not any(c < other for other in candidates)]
+        self.subs = [''.join(self.labels[v] for v in c) for c in self.cliques]
+        
+        # Empty separators are kept (as scalar messages) so that the tree
+        # also spans disconnected parts of the network
+        clique_graph = nx.Graph()
+        clique_graph.add_nodes_from(range(len(self.cliques)))
+        for i, j in combinations(range(len(self.cliques)), 2):
+            clique_graph.add_edge(i, j, weight=len(set(self.cliques[i]) & set(self.cliques[j])))
+        tree = nx.maximum_spanning_tree(clique_graph)
+        self.neighbours = {i: sorted(tree[i]) for i in tree}
+        self.edges = list(nx.dfs_edges(tree, 0))  # Parent -> child, root first
+        
+        self.potentials = [np.ones([self.n_states[v] for v in c], dtype=dtype) for c in self.cliques]
+        for node in graph:
+            family = [node] + cpds[node]['parents']
+            host = min((i for i, c in enumerate(self.cliques) if set(family) <= set(c)),
+                       key=lambda i: self.potentials[i].size)
+            self.potentials[host] = self.contract(
+                [(self.subs[host], self.potentials[host]),
+                 (''.join(self.labels[v] for v in family), cpds[node]['table'])], self.subs[host])
+        
+        self.node_to_clique = {node: min((i for i, c in enumerate(self.cliques) if node in c),
+                                         key=lambda i: self.potentials[i].size)
+                               for node in graph}
+    
+    def contract(self, operands: List[Tuple[str, np.ndarray]], output: str) -> np.ndarray:
+        """Multiply (subscript, factor) pairs and sum out every axis not in output."""
+        expr = ','.join(sub for sub, _ in operands) + '->' + output
+        factors = [factor for _, factor in operands]
+        if expr not in self._einsum_paths:
+            self._einsum_paths[expr] = np.einsum_path(expr, *factors, optimize='greedy')[0]
+        return np.einsum(expr, *factors, optimize=self._einsum_paths[expr])
+    
+    def propagate(self, evidence: Dict[str, int]) -> List[np.ndarray]:
+        """
+        Clique beliefs given evidence as {node: state code}.
+        
+        One collect and one distribute pass of Shafer-Shenoy messages leave
+        each clique with the unnormalized joint of its variables and the
+        evidence, one axis per variable in self.cliques order.
+        """
+        potentials = list(self.potentials)
+        for node, code in evidence.items():
+            host = self.node_to_clique[node]
+            indicator = np.zeros(self.n_states[node], dtype=potentials[host].dtype)
+            indicator[code] = 1.0
+            potentials[host] = self.contract([(self.subs[host], potentials[host]),
+                                              (self.labels[node], indicator)], self.subs[host])
+        
+        messages = {}  # (sender, receiver) -> (separator subscripts, message)
+        
+        def send(sender: int, receiver: int):
+            separator = ''.join(l for l in self.subs[sender] if l in self.subs[receiver])
+            operands = [(self.subs[sender], potentials[sender])]
+            operands += [messages[(n, sender)] for n in self.neighbours[sender] if n != receiver]
+            messages[(sender, receiver)] = (separator, self.contract(operands, separator))
+        
+        for parent, child in reversed(self.edges):
+            send(child, parent)
+        for parent, child in self.edges:
+            send(parent, child)
+        
+        return [self.contract([(self.subs[i], potentials[i])] +
+                              [messages[(n, i)] for n in self.neighbours[i]], self.subs[i])
+                for i in range(len(self.cliques))]
+    
+    def marginal(self, beliefs: List[np.ndarray], node: str) -> np.ndarray:
+        """Unnormalized marginal of node, summed out of its host clique's belief."""
+        host = self.node_to_clique[node]
+        return self.contract([(self.subs[host], beliefs[host])], self.labels[node])
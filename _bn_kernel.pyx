@@ -0,0 +1,32 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled joint-probability kernel for trump_tariffs_2025_blackswan.
+
+Optional: the module falls back to its numba / pure-Python kernel when this
+extension is not built. Build it in place with
+
+    pip install cython
+    cythonize -i _bn_kernel.pyx
+"""
+
+
+cpdef double joint_prob(const long long[::1] assign, const long long[::1] order,
+                        const double[::1] cpd_flat, const long long[::1] cpd_offsets,
+                        const long long[::1] node_strides, const int[::1] parent_ptr,
+                        const int[::1] parent_ids, const long long[::1] parent_strides):
+    """
+    Product of the CPD entries selected by an integer-coded assignment.
+
+    Same array layout as _joint_prob_nb: CPDs concatenated in cpd_flat and
+    node n's parents in the CSR slice parent_ptr[n]:parent_ptr[n + 1].
+    """
+    cdef double prob = 1.0
+    cdef Py_ssize_t i, j, n
+    cdef long long off
+    for i in range(order.shape[0]):
+        n = order[i]
+        off = cpd_offsets[n] + node_strides[n] * assign[n]
+        for j in range(parent_ptr[n], parent_ptr[n + 1]):
+            off += parent_strides[j] * assign[parent_ids[j]]
+        prob *= cpd_flat[off]
+    return prob
@@ -15,11 +15,40 @@ Key features of Rebonato-Denev methodology:
 4. Asset allocation under stress conditions
 """
 
+import os
 import numpy as np
 import networkx as nx
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 import matplotlib.pyplot as plt
-from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+
+from _bn_common import JunctionTree, njit
+
+# JAX/NumPyro are imported lazily (slow to import) and only used by the 'jax' backend
+GOT_NUMPYRO = find_spec('jax') is not None and find_spec('numpyro') is not None
+
+
+@njit(cache=True)
+def _log_joint_kernel(assign, cpd_flat, cpd_offsets, node_strides,
+                      parent_ptr, parent_pos, parent_strides):
+    """
+    Log joint probability of one integer-coded complete assignment.
+    
+    All arrays are laid out in topological order: log-CPDs are concatenated
+    into cpd_flat, and the parents of node n are the CSR slice
+    parent_ptr[n]:parent_ptr[n + 1] of parent_pos/parent_strides.
+    Returns -inf as soon as a factor is zero.
+    """
+    logp = 0.0
+    for n in range(assign.shape[0]):
+        offset = cpd_offsets[n] + assign[n] * node_strides[n]
+        for j in range(parent_ptr[n], parent_ptr[n + 1]):
+            offset += parent_strides[j] * assign[parent_pos[j]]
+        logp += cpd_flat[offset]
+        if logp == -np.inf:
+            return logp
+    return logp
 
 
 class BayesianNetwork:
@@ -34,15 +63,21 @@ class BayesianNetwork:
         self.graph = nx.DiGraph()
         self.cpds = {}  # Conditional Probability Distributions
         self.states = {}  # Possible states for each variable
+        self._dirty = True  # Structure changed since the last _finalize()
+        self._pos = None  # Cached visualize() layout
         
     def add_node(self, node: str, states: List[str]):
         """Add a node with its possible states."""
         self.graph.add_node(node)
         self.states[node] = states
+        self._dirty = True
+        self._pos = None
         
     def add_edge(self, parent: str, child: str):
         """Add a causal edge from parent to child."""
         self.graph.add_edge(parent, child)
+        self._dirty = True
+        self._pos = None
         
     def set_cpd(self, node: str, cpd: np.ndarray, parent_order: List[str] = None):
         """
@@ -56,171 +91,376 @@ class BayesianNetwork:
             The conditional probability table
         parent_order : List[str]
             Order of parents (important for indexing CPD correctly)
+        
+        Besides the table itself, a sampling layout is stored: 'flat' holds
+        one column per parent combination, shape (n_states, prod(parent_dims)),
+        Fortran-ordered and normalized per column, and 'parent_strides' maps
+        parent state indices to a column number.
+        
+        Tables are stored as contiguous float32, which is ample for
+        probabilities of ordinary magnitude; inputs below ~1e-7 lose relative
+        precision and are better modelled in log space. 'log_table' keeps a
+        float64 log of the table (-inf for impossible entries) for
+        _calculate_joint_probability.
         """
+        cpd = np.ascontiguousarray(cpd, dtype=np.float32)
+        parent_dims = cpd.shape[1:]
+        parent_strides = [int(np.prod(parent_dims[i + 1:])) for i in range(len(parent_dims))]
+        
+        flat = cpd.reshape(cpd.shape[0], -1)
+        totals = flat.sum(axis=0)
+        normalized = bool(np.all(np.abs(totals - 1) < 1e-5))
+        if not normalized:
+            flat = np.where(totals > 0, flat / np.where(totals > 0, totals, 1.0),
+                            1.0 / cpd.shape[0])  # Uniform distribution as fallback
+        
+        with np.errstate(divide='ignore'):
+            log_table = np.log(cpd.astype(np.float64))
+        
         self.cpds[node] = {
             'table': cpd,
-            'parents': parent_order if parent_order else []
+            'log_table': log_table,
+            'normalized': normalized,
+            'parents': parent_order if parent_order else [],
+            'flat': np.asfortranarray(flat, dtype=np.float32),
+            'parent_strides': np.array(parent_strides, dtype=np.int64)
         }
+        self._dirty = True
+        
+    def _finalize(self):
+        """
+        If the network changed: cache the topological order and codes, descendants,
+        sampling CDFs (_node_info) and log-CPDs (_joint_args); drop compiled state.
+        """
+        if not self._dirty:
+            return
+        
+        # Among nodes free to go next, put CPDs with the most zeros first so
+        # _log_joint_kernel hits zero factors (and exits) as early as possible
+        insertion = {node: i for i, node in enumerate(self.graph.nodes())}
+        zeros = {node: int(np.count_nonzero(self.cpds[node]['table'] == 0)) for node in self.graph}
+        self._topo_order = list(nx.lexicographical_topological_sort(
+            self.graph, key=lambda node: (-zeros[node], insertion[node])))
+        self._topo_pos = {node: i for i, node in enumerate(self._topo_order)}
+        
+        self._parents_int = {node: np.array([self._topo_pos[p] for p in self.cpds[node]['parents']],
+                                            dtype=np.int32)
+                             for node in self._topo_order}
+        self._state_to_int = {node: {state: i for i, state in enumerate(self.states[node])}
+                              for node in self._topo_order}
+        self._descendants = {node: nx.descendants(self.graph, node) for node in self._topo_order}
+        self._node_info = []
+        for node in self._topo_order:
+            flat = self.cpds[node]['flat']
+            cdf = np.cumsum(flat, axis=0)
+            # Pin the CDF to 1.0 from each column's last possible state on, so
+            # float32 rounding can't push a uniform past it into a zero state
+            last = flat.shape[0] - 1 - np.argmax(flat[::-1] > 0, axis=0)
+            cdf[np.arange(flat.shape[0])[:, None] >= last] = 1.0
+            self._node_info.append((self.cpds[node]['flat'], cdf,
+                                    self.cpds[node]['parent_strides'], self._parents_int[node],
+                                    self._state_to_int[node], len(self.states[node])))
+        
+        # Flattened log-CPDs and strides for _log_joint_kernel
+        tables = [self.cpds[node]['log_table'] for node in self._topo_order]
+        cpd_offsets = np.cumsum([0] + [t.size for t in tables[:-1]])
+        node_strides = [t.strides[0] // t.itemsize for t in tables]
+        parent_strides = [st // t.itemsize for t in tables for st in t.strides[1:]]
+        parents_int = [self._parents_int[node] for node in self._topo_order]
+        parent_ptr = np.cumsum([0] + [len(p) for p in parents_int])
+        parent_pos = np.concatenate(parents_int)
+        self._joint_args = (np.concatenate([t.ravel() for t in tables]),
+                            np.asarray(cpd_offsets, dtype=np.int64),
+                            np.asarray(node_strides, dtype=np.int64),
+                            np.asarray(parent_ptr, dtype=np.int64),
+                            np.asarray(parent_pos, dtype=np.int64),
+                            np.asarray(parent_strides, dtype=np.int64))
+        
+        self._junction_tree = None  # Rebuilt by the next compile()
+        self._posteriors = {}  # Memoized get_probability() results, keyed by evidence
+        self._dirty = False
+        
+    def compile(self):
+        """Compile the network into a junction tree (as in gRain's compile())."""
+        self._finalize()
+        if self._junction_tree is None:
+            self._junction_tree = JunctionTree(self.graph, self.cpds, self.states, self._topo_pos)
+        
+    def propagate(self, evidence: Dict[str, str]) -> List[np.ndarray]:
+        """Absorb evidence into the junction tree; returns every clique's belief."""
+        self.compile()
+        return self._junction_tree.propagate({node: self._state_to_int[node][state]
+                                              for node, state in evidence.items()})
         
     def get_probability(self, evidence: Dict[str, str]) -> Dict[str, float]:
         """
         Calculate probabilities given evidence using inference.
         
-        This is a simplified exact inference for the small network.
+        Exact inference on the junction tree. Posteriors are memoized per
+        evidence set until the network changes, so repeated queries are
+        dictionary lookups.
         """
-        # For this demo, we'll use enumeration
-        return self._variable_elimination(evidence)
+        self.compile()
+        key = frozenset(evidence.items())
+        if key not in self._posteriors:
+            self._posteriors[key] = self._variable_elimination(evidence)
+        return {node: dict(probs) for node, probs in self._posteriors[key].items()}
     
     def _variable_elimination(self, evidence: Dict[str, str]) -> Dict[str, Dict[str, float]]:
-        """Simple variable elimination for inference."""
+        """
+        Posterior marginals of every hidden node from one propagation,
+        reading nodes with only barren, normalized descendants off their CPD.
+        """
         results = {}
         
         # Get all nodes not in evidence
         hidden_nodes = [n for n in self.graph.nodes() if n not in evidence]
         
-        # For each hidden variable, marginalize over all other hidden variables
+        direct, remaining = {}, []
         for query_node in hidden_nodes:
-            probs = {}
-            
-            for query_state in self.states[query_node]:
-                total_prob = 0.0
-                
-                # Generate all possible assignments for other hidden nodes
-                other_hidden = [n for n in hidden_nodes if n != query_node]
-                
-                if not other_hidden:
-                    # Only this node is hidden
-                    assignment = {**evidence, query_node: query_state}
-                    total_prob = self._calculate_joint_probability(assignment)
-                else:
-                    # Enumerate over all combinations of other hidden variables
-                    other_states = [self.states[n] for n in other_hidden]
-                    
-                    for state_combo in product(*other_states):
-                        assignment = {**evidence, query_node: query_state}
-                        for i, node in enumerate(other_hidden):
-                            assignment[node] = state_combo[i]
-                        
-                        total_prob += self._calculate_joint_probability(assignment)
-                
-                probs[query_state] = total_prob
+            cpd = self.cpds[query_node]
+            descendants = self._descendants[query_node]
+            if (all(p in evidence for p in cpd['parents'])
+                    and not any(d in evidence or not self.cpds[d]['normalized'] for d in descendants)):
+                column = tuple(self._state_to_int[p][evidence[p]] for p in cpd['parents'])
+                direct[query_node] = cpd['table'][(slice(None),) + column]
+            else:
+                remaining.append(query_node)
+        
+        marginals = {}
+        if remaining:
+            beliefs = self.propagate(evidence)
+            for query_node in remaining:
+                marginals[query_node] = self._junction_tree.marginal(beliefs, query_node)
+            possible = beliefs[0].sum() > 0
+        else:
+            # Every observed node then has only observed parents, so the
+            # evidence is impossible iff one of its entries (or a whole
+            # direct column) is zero
+            possible = (all(self.cpds[node]['table'][
+                            tuple(self._state_to_int[v][evidence[v]]
+                                  for v in [node] + self.cpds[node]['parents'])] > 0
+                            for node in evidence)
+                        and all(column.sum() > 0 for column in direct.values()))
+        
+        # Impossible evidence gives all-zero marginals, as from propagate()
+        for query_node, column in direct.items():
+            marginals[query_node] = column if possible else np.zeros_like(column)
+        
+        for query_node in hidden_nodes:
+            marginal = marginals[query_node]
             
             # Normalize
-            total = sum(probs.values())
+            total = marginal.sum()
             if total > 0:
-                probs = {k: v/total for k, v in probs.items()}
-            results[query_node] = probs
+                marginal = marginal / total
+            results[query_node] = {state: float(marginal[i])
+                                   for i, state in enumerate(self.states[query_node])}
             
         return results
     
-    def _calculate_joint_probability(self, assignment: Dict[str, str]) -> float:
-        """Calculate joint probability of a complete assignment."""
-        prob = 1.0
-        
-        for node in nx.topological_sort(self.graph):
-            if node not in assignment:
-                return 0.0
-                
-            parents = list(self.graph.predecessors(node))
+    def codegen(self, func_name: str = 'infer') -> Callable[[Dict[str, str]], Dict[str, Dict[str, float]]]:
+        """
+        Generate a loop-free inference function for this exact network,
+        with the same signature and results as get_probability().
+        """
+        self._finalize()
+        topo = self._topo_order
+        n = len(topo)
+        namespace = {}
+        
+        factors, masks = [], []
+        for i, node in enumerate(topo):
+            positions = [self._topo_pos[a] for a in [node] + self.cpds[node]['parents']]
+            namespace[f'CPD_{i}'] = np.transpose(self.cpds[node]['table'], np.argsort(positions))
+            k = len(self.states[node])
+            namespace[f'EV_{i}'] = np.vstack([np.eye(k), np.ones(k)])  # row -1: unobserved
             
-            if not parents:
-                # Root node - use prior
-                cpd = self.cpds[node]['table']
-                node_state_idx = self.states[node].index(assignment[node])
-                prob *= cpd[node_state_idx]
-            else:
-                # Get parent states
-                parent_states = tuple(assignment[p] for p in self.cpds[node]['parents'])
-                
-                # Find index in CPD
-                cpd = self.cpds[node]['table']
-                node_state_idx = self.states[node].index(assignment[node])
-                
-                # Calculate parent combination index
-                parent_indices = []
-                for i, parent in enumerate(self.cpds[node]['parents']):
-                    parent_state_idx = self.states[parent].index(assignment[parent])
-                    parent_indices.append(parent_state_idx)
-                
-                # Index into CPD (node_state, parent1_state, parent2_state, ...)
-                indices = [node_state_idx] + parent_indices
-                prob *= cpd[tuple(indices)]
-                
-        return prob
-    
-    def sample(self, evidence: Dict[str, str] = None, n_samples: int = 1000) -> Dict[str, np.ndarray]:
+            cpd_index = ', '.join(':' if j in positions else 'None' for j in range(n))
+            ev_index = ', '.join(':' if j == i else 'None' for j in range(n))
+            factors.append(f'CPD_{i}[{cpd_index}]  # {node}')
+            masks.append(f'EV_{i}[ev[{i}]][{ev_index}]')
+        
+        lines = [f'def {func_name}(ev):',
+                 '    joint = (' + factors[0]]
+        lines += [f'             * {factor}' for factor in factors[1:]]
+        lines += ['             )']
+        lines += [f'    joint = joint * {mask}' for mask in masks]
+        for i in range(n):
+            others = tuple(j for j in range(n) if j != i)
+            lines.append(f'    p_{i} = joint.sum(axis={others})')
+        lines.append('    return (' + ', '.join(f'p_{i}' for i in range(n)) + ',)')
+        source = '\n'.join(lines) + '\n'
+        
+        exec(compile(source, f'<bn:{func_name}>', 'exec'), namespace)
+        kernel = namespace[func_name]
+        state_to_int, topo_pos = self._state_to_int, self._topo_pos
+        
+        def infer(evidence: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+            marginals = kernel([state_to_int[node][evidence[node]] if node in evidence else -1
+                                for node in topo])
+            results = {}
+            for node in self.graph.nodes():
+                if node in evidence:
+                    continue
+                marginal = marginals[topo_pos[node]]
+                total = marginal.sum()
+                if total > 0:
+                    marginal = marginal / total
+                results[node] = {state: float(marginal[i]) for i, state in enumerate(self.states[node])}
+            return results
+        
+        infer.__name__ = func_name
+        infer.source = source
+        return infer
+    
+    def _calculate_joint_probability(self, assignment: Dict[str, str]) -> float:
+        """
+        Calculate joint probability of a complete assignment.
+        
+        This is exp(_log_joint_probability(assignment)), so it still
+        underflows to 0.0 for very improbable assignments in large networks;
+        compare or accumulate those through _log_joint_probability instead.
+        """
+        return float(np.exp(self._log_joint_probability(assignment)))
+    
+    def _log_joint_probability(self, assignment: Dict[str, str]) -> float:
+        """
+        Log joint probability of a complete assignment (-inf if impossible
+        or incomplete).
+        
+        The CPD entries are summed as log-probabilities in _log_joint_kernel,
+        compiled with numba when it is installed, so the result
+        stays finite however many small factors are involved.
+        """
+        self._finalize()
+        
+        if any(node not in assignment for node in self._topo_order):
+            return -np.inf
+        
+        assign = np.array([self._state_to_int[node][assignment[node]]
+                           for node in self._topo_order], dtype=np.int64)
+        return float(_log_joint_kernel(assign, *self._joint_args))
+    
+    def sample(self, evidence: Dict[str, str] = None, n_samples: int = 1000,
+               seed: int = None) -> Dict[str, np.ndarray]:
         """
         Forward sampling from the network.
+        
+        Nodes are visited once each in topological order and all n_samples
+        values of a node are drawn together, conditioned on the parent
+        columns already drawn, by inverse-CDF lookup of one block of
+        uniforms in the CDF columns precomputed by _finalize().
+        
+        Returns one np.int8 array of length n_samples per node, holding
+        state indices into self.states[node] (e.g. tally them with
+        np.bincount rather than comparing label strings).
         """
-        samples = {node: [] for node in self.graph.nodes()}
+        self._finalize()
+        evidence = evidence or {}
+        rng = np.random.default_rng(seed)
+        out = np.empty((len(self._topo_order), n_samples), dtype=np.int8)
         
-        for _ in range(n_samples):
-            assignment = evidence.copy() if evidence else {}
+        for i, node in enumerate(self._topo_order):
+            _, cum, parent_strides, parents, state_to_int, _ = self._node_info[i]
             
-            for node in nx.topological_sort(self.graph):
-                if node in assignment:
-                    samples[node].append(assignment[node])
-                    continue
-                    
-                parents = list(self.graph.predecessors(node))
-                
-                if not parents:
-                    # Sample from prior
-                    probs = self.cpds[node]['table']
-                    state = np.random.choice(self.states[node], p=probs)
+            if node in evidence:
+                out[i] = state_to_int[evidence[node]]
+                continue
+            
+            u = rng.random(n_samples, dtype=np.float32)
+            if not len(parents):
+                # Sample from prior: one shared CDF
+                out[i] = np.searchsorted(cum[:, 0], u, side='right')
+            else:
+                # Gather each sample's CDF column and count the entries at or below u
+                flat_parent_idx = parent_strides @ out[parents]
+                out[i] = (cum[:, flat_parent_idx] <= u).sum(axis=0)
+        
+        return {node: out[self._topo_pos[node]] for node in self.graph.nodes()}
+    
+    def to_numpyro_model(self, evidence: Dict[str, str] = None) -> Callable[[], None]:
+        """
+        Express the network as a NumPyro model for forward sampling.
+        
+        Each node becomes a Categorical site, visited in topological order,
+        whose probabilities are the flat CPD column selected by the parent
+        values. Evidence nodes are fixed with numpyro.deterministic sites.
+        Requires jax and numpyro.
+        """
+        import jax.numpy as jnp
+        import numpyro
+        import numpyro.distributions as dist
+        
+        self._finalize()
+        evidence = evidence or {}
+        nodes = [(node, jnp.asarray(cpd_flat.T), jnp.asarray(parent_strides), parents,
+                  state_to_int[evidence[node]] if node in evidence else None)
+                 for node, (cpd_flat, _, parent_strides, parents, state_to_int, _)
+                 in zip(self._topo_order, self._node_info)]
+        
+        def model():
+            values = []
+            for node, columns, parent_strides, parents, observed in nodes:
+                if observed is not None:
+                    value = numpyro.deterministic(node, jnp.asarray(observed))
                 else:
-                    # Sample conditional on parents
-                    parent_states = [assignment[p] for p in self.cpds[node]['parents']]
-                    parent_indices = [self.states[p].index(parent_states[i]) 
-                                    for i, p in enumerate(self.cpds[node]['parents'])]
-                    
-                    # Get conditional distribution
-                    cpd = self.cpds[node]['table']
-                    
-                    # Build the index tuple
-                    index = [slice(None)] + parent_indices  # slice(None) for the node dimension
-                    cond_probs = cpd[tuple(index)]
-                    
-                    # Ensure it's 1D and normalized
-                    cond_probs = np.array(cond_probs).flatten()
-                    if cond_probs.sum() > 0:
-                        cond_probs = cond_probs / cond_probs.sum()
-                    else:
-                        # Uniform distribution as fallback
-                        cond_probs = np.ones(len(self.states[node])) / len(self.states[node])
-                    
-                    state = np.random.choice(self.states[node], p=cond_probs)
-                
-                assignment[node] = state
-                samples[node].append(state)
-                
-        return samples
+                    column = jnp.dot(parent_strides, jnp.stack([values[p] for p in parents])) \
+                        if len(parents) else 0
+                    value = numpyro.sample(node, dist.Categorical(probs=jnp.take(columns, column, axis=0)))
+                values.append(value)
+        
+        return model
+    
+    def sample_numpyro(self, evidence: Dict[str, str] = None, n_samples: int = 1000,
+                       seed: int = None) -> Dict[str, np.ndarray]:
+        """
+        Forward sampling on JAX (GPU/TPU when available) via NumPyro.
+        
+        Runs to_numpyro_model() under a jitted, vectorized Predictive and
+        returns the same int8 state-code arrays as sample().
+        """
+        import jax
+        from numpyro.infer import Predictive
+        
+        predictive = Predictive(self.to_numpyro_model(evidence), num_samples=n_samples, parallel=True)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        draws = jax.jit(predictive)(jax.random.PRNGKey(seed % 2**32))
+        return {node: np.asarray(draws[node], dtype=np.int8) for node in self.graph.nodes()}
     
     def visualize(self, filename: str = None):
         """Visualize the Bayesian network structure."""
         plt.figure(figsize=(12, 8))
+        ax = plt.gca()
         
-        # Use hierarchical layout
-        pos = nx.spring_layout(self.graph, k=2, iterations=50)
+        # Hierarchical layout via graphviz 'dot' when available; computed once
+        # per network structure
+        if self._pos is None:
+            try:
+                self._pos = nx.nx_agraph.graphviz_layout(self.graph, prog='dot')
+            except (ImportError, OSError, ValueError):
+                self._pos = nx.spring_layout(self.graph, k=2, iterations=20, seed=0)
+        pos = self._pos
         
         # Draw nodes
         nx.draw_networkx_nodes(self.graph, pos, node_color='lightblue', 
-                              node_size=3000, alpha=0.9)
+                              node_size=3000, alpha=0.9, ax=ax)
         
         # Draw edges with arrows
         nx.draw_networkx_edges(self.graph, pos, edge_color='gray', 
                               arrows=True, arrowsize=20, width=2,
-                              arrowstyle='->', connectionstyle='arc3,rad=0.1')
+                              arrowstyle='->', connectionstyle='arc3,rad=0.1', ax=ax)
         
         # Draw labels
-        nx.draw_networkx_labels(self.graph, pos, font_size=10, font_weight='bold')
+        nx.draw_networkx_labels(self.graph, pos, font_size=10, font_weight='bold', ax=ax)
         
         plt.title("Bayesian Network: Eurozone Crisis Scenario\n(Rebonato-Denev Methodology)", 
                  fontsize=14, fontweight='bold')
         plt.axis('off')
-        plt.tight_layout()
         
         if filename:
+            plt.tight_layout()
             plt.savefig(filename, dpi=300, bbox_inches='tight')
         plt.show()
 
@@ -302,43 +542,44 @@ def build_eurozone_crisis_network() -> BayesianNetwork:
          [0.20, 0.70]]   # Political = Low, High | Breakup = Yes
     ])
     
-    # Reshape to proper format: [node_state, parent1_state, parent2_state]
-    eurozone_cpd_formatted = np.zeros((2, 2, 2))
-    for pol in range(2):
-        for econ in range(2):
-            eurozone_cpd_formatted[0, pol, econ] = eurozone_cpd[econ][0][pol]  # No
-            eurozone_cpd_formatted[1, pol, econ] = eurozone_cpd[econ][1][pol]  # Yes
+    # Reorder axes (economic, breakup, political) -> (breakup, political, economic)
+    eurozone_cpd_formatted = np.transpose(eurozone_cpd, (1, 2, 0))
+    assert eurozone_cpd_formatted.shape == (2, 2, 2)
+    assert np.allclose(eurozone_cpd_formatted.sum(axis=0), 1)
     
     bn.set_cpd('Eurozone_Breakup', eurozone_cpd_formatted, 
               ['Political_Instability', 'Economic_Weakness'])
     
+    # Single-parent CPDs below are written in final (node_state, parent_state)
+    # layout: one row per node state, one column per parent state
+    
     # P(Credit_Spreads | Eurozone_Breakup)
     credit_cpd = np.array([
-        [0.80, 0.10],  # [Normal, Widening] | Breakup = No
-        [0.20, 0.90]   # [Normal, Widening] | Breakup = Yes
+        [0.80, 0.20],  # Normal   | Breakup = No, Yes
+        [0.10, 0.90]   # Widening | Breakup = No, Yes
     ])
-    bn.set_cpd('Credit_Spreads', credit_cpd.T, ['Eurozone_Breakup'])
+    bn.set_cpd('Credit_Spreads', credit_cpd, ['Eurozone_Breakup'])
     
     # P(Flight_to_Quality | Eurozone_Breakup)
     flight_cpd = np.array([
-        [0.85, 0.10],  # [No, Yes] | Breakup = No
-        [0.15, 0.90]   # [No, Yes] | Breakup = Yes
+        [0.85, 0.15],  # No  | Breakup = No, Yes
+        [0.10, 0.90]   # Yes | Breakup = No, Yes
     ])
-    bn.set_cpd('Flight_to_Quality', flight_cpd.T, ['Eurozone_Breakup'])
+    bn.set_cpd('Flight_to_Quality', flight_cpd, ['Eurozone_Breakup'])
     
     # P(Corporate_Bonds | Credit_Spreads)
     corp_bonds_cpd = np.array([
-        [0.90, 0.20],  # [Stable, Falling] | Spreads = Normal
-        [0.10, 0.80]   # [Stable, Falling] | Spreads = Widening
+        [0.90, 0.10],  # Stable  | Spreads = Normal, Widening
+        [0.20, 0.80]   # Falling | Spreads = Normal, Widening
     ])
-    bn.set_cpd('Corporate_Bonds', corp_bonds_cpd.T, ['Credit_Spreads'])
+    bn.set_cpd('Corporate_Bonds', corp_bonds_cpd, ['Credit_Spreads'])
     
     # P(Government_Bonds | Flight_to_Quality)
     gov_bonds_cpd = np.array([
-        [0.80, 0.10],  # [Stable, Rally] | Flight = No
-        [0.20, 0.90]   # [Stable, Rally] | Flight = Yes
+        [0.80, 0.20],  # Stable | Flight = No, Yes
+        [0.10, 0.90]   # Rally  | Flight = No, Yes
     ])
-    bn.set_cpd('Government_Bonds', gov_bonds_cpd.T, ['Flight_to_Quality'])
+    bn.set_cpd('Government_Bonds', gov_bonds_cpd, ['Flight_to_Quality'])
     
     # P(Equities | Credit_Spreads, Flight_to_Quality)
     # More complex - equities affected by both spreads and flight to quality
@@ -502,12 +743,44 @@ def portfolio_implications(scenario_results: Dict):
     print()
 
 
-def monte_carlo_simulation(bn: BayesianNetwork, evidence: Dict = None, n_sims: int = 10000):
+def _sample_chunk(bn: BayesianNetwork, evidence: Dict, n_samples: int,
+                  seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Worker entry point for parallel_sample (module level so it pickles)."""
+    return bn.sample(evidence=evidence, n_samples=n_samples, seed=seed)
+
+
+def parallel_sample(bn: BayesianNetwork, evidence: Dict = None, n_samples: int = 10000,
+                    n_workers: int = None, seed: int = None) -> Dict[str, np.ndarray]:
+    """
+    Forward sampling split across worker processes.
+    
+    n_samples is divided evenly over n_workers processes (default: one per
+    CPU), each drawing from an independent stream spawned from
+    np.random.SeedSequence(seed); the int8 code arrays are concatenated
+    in worker order.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    sizes = [n_samples // n_workers + (i < n_samples % n_workers) for i in range(n_workers)]
+    seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        chunks = list(pool.map(_sample_chunk, [bn] * n_workers, [evidence] * n_workers,
+                               sizes, seeds))
+    return {node: np.concatenate([chunk[node] for chunk in chunks]) for node in bn.graph.nodes()}
+
+
+def monte_carlo_simulation(bn: BayesianNetwork, evidence: Dict = None, n_sims: int = 10000,
+                           backend: str = 'numpy', n_workers: int = None):
     """
     Perform Monte Carlo simulation for portfolio stress testing.
     
     This demonstrates how to use the Bayesian network for
     large-scale portfolio simulations.
+    
+    backend='jax' runs the sampler through NumPyro on JAX (useful for very
+    large n_sims on GPU); it falls back to the NumPy sampler if jax or
+    numpyro is not installed. With the NumPy backend, n_workers > 1
+    splits the simulations across that many processes (see parallel_sample).
     """
     
     print("=" * 80)
@@ -516,7 +789,17 @@ def monte_carlo_simulation(bn: BayesianNetwork, evidence: Dict = None, n_sims: i
     print("=" * 80)
     print()
     
-    samples = bn.sample(evidence=evidence, n_samples=n_sims)
+    if backend == 'jax' and not GOT_NUMPYRO:
+        print("JAX/NumPyro not installed - using the NumPy sampler")
+        print()
+        backend = 'numpy'
+    
+    if backend == 'jax':
+        samples = bn.sample_numpyro(evidence=evidence, n_samples=n_sims)
+    elif n_workers and n_workers > 1:
+        samples = parallel_sample(bn, evidence=evidence, n_samples=n_sims, n_workers=n_workers)
+    else:
+        samples = bn.sample(evidence=evidence, n_samples=n_sims)
     
     print("Simulation Results:")
     print("-" * 80)
@@ -526,8 +809,8 @@ def monte_carlo_simulation(bn: BayesianNetwork, evidence: Dict = None, n_sims: i
             continue
         print(f"\n{node}:")
         states = bn.states[node]
-        for state in states:
-            count = samples[node].count(state)
+        counts = np.bincount(samples[node], minlength=len(states))
+        for state, count in zip(states, counts):
             prob = count / n_sims
             print(f"  {state}: {prob:.2%} ({count:,} occurrences)")
     
@@ -537,17 +820,18 @@ def monte_carlo_simulation(bn: BayesianNetwork, evidence: Dict = None, n_sims: i
     print("=" * 80)
     
     # Find scenarios where Eurozone breaks up
-    breakup_indices = [i for i, v in enumerate(samples['Eurozone_Breakup']) if v == 'Yes']
-    n_breakup = len(breakup_indices)
+    breakup = samples['Eurozone_Breakup'] == bn.states['Eurozone_Breakup'].index('Yes')
+    n_breakup = np.count_nonzero(breakup)
     
     if n_breakup > 0:
         print(f"\nIn scenarios with Eurozone Breakup ({n_breakup:,} cases, {n_breakup/n_sims:.1%}):")
         print("-" * 80)
         
-        for asset in ['Corporate_Bonds', 'Government_Bonds', 'Equities']:
-            falling_count = sum(1 for i in breakup_indices 
-                              if samples[asset][i] in ['Falling', 'Rally'])
-            state_name = 'Rally' if asset == 'Government_Bonds' else 'Falling'
+        adverse_states = {'Corporate_Bonds': 'Falling', 'Government_Bonds': 'Rally', 'Equities': 'Falling'}
+        target_idx = {asset: bn.states[asset].index(state) for asset, state in adverse_states.items()}
+        
+        for asset, state_name in adverse_states.items():
+            falling_count = np.count_nonzero(samples[asset][breakup] == target_idx[asset])
             print(f"  {asset} {state_name}: {falling_count/n_breakup:.1%}")
     
     return samples
@@ -6,7 +6,7 @@ Quick test to verify all dependencies are properly installed.
 """
 
 import sys
-import importlib
+from importlib.metadata import version, PackageNotFoundError
 from typing import List, Tuple
 
 # ANSI color codes
@@ -36,25 +36,16 @@ def check_python_version() -> Tuple[bool, str]:
         return False, f"Python {version_str} (3.8+ required)"
 
 
-def check_package(package_name: str, import_name: str = None) -> Tuple[bool, str]:
-    """Check if a package is installed and get version."""
-    if import_name is None:
-        import_name = package_name
+def check_package(package_name: str) -> Tuple[bool, str]:
+    """
+    Check if a package is installed and get version.
     
+    Reads the installed distribution metadata instead of importing the
+    package; the imports happen once, in run_functionality_test().
+    """
     try:
-        module = importlib.import_module(import_name)
-        
-        # Try to get version
-        version = "unknown"
-        for attr in ['__version__', 'VERSION', 'version']:
-            if hasattr(module, attr):
-                version = getattr(module, attr)
-                if callable(version):
-                    version = version()
-                break
-        
-        return True, f"{package_name} {version}"
-    except ImportError:
+        return True, f"{package_name} {version(package_name)}"
+    except PackageNotFoundError:
         return False, f"{package_name} (not installed)"
 
 
@@ -106,14 +97,10 @@ def main():
     
     # Check required packages
     print(f"{BLUE}Checking required packages...{RESET}")
-    required_packages = [
-        ('numpy', 'numpy'),
-        ('networkx', 'networkx'),
-        ('matplotlib', 'matplotlib'),
-    ]
+    required_packages = ['numpy', 'networkx', 'matplotlib']
     
-    for package_name, import_name in required_packages:
-        passed, message = check_package(package_name, import_name)
+    for package_name in required_packages:
+        passed, message = check_package(package_name)
         if passed:
             print(f"  {GREEN}✓{RESET} {message}")
         else:
@@ -124,14 +111,10 @@ def main():
     
     # Check optional packages
     print(f"{BLUE}Checking optional packages...{RESET}")
-    optional_packages = [
-        ('jupyter', 'jupyter'),
-        ('pandas', 'pandas'),
-        ('seaborn', 'seaborn'),
-    ]
+    optional_packages = ['jupyter', 'pandas', 'seaborn']
     
-    for package_name, import_name in optional_packages:
-        passed, message = check_package(package_name, import_name)
+    for package_name in optional_packages:
+        passed, message = check_package(package_name)
         if passed:
             print(f"  {GREEN}✓{RESET} {message}")
         else:
@@ -0,0 +1,208 @@
+"""
+Regression tests for the Bayesian network implementations.
+
+Run with: python -m pytest test_networks.py
+"""
+
+import copy
+import itertools
+import math
+import pickle
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pytest
+
+from rebonato_denev_eurozone_crisis import BayesianNetwork, build_eurozone_crisis_network, parallel_sample
+import trump_tariffs_2025_blackswan
+from trump_tariffs_2025_blackswan import TrumpTariffsBayesianNetwork, build_trump_tariffs_network
+
+
+def test_codegen_keeps_network_picklable():
+    """codegen() must not attach anything to the network that breaks pickling."""
+    bn = build_eurozone_crisis_network()
+    infer = bn.codegen()
+
+    evidence = {'Political_Instability': 'High'}
+    expected = bn.get_probability(evidence)
+    for node, probs in infer(evidence).items():
+        for state, p in probs.items():
+            assert abs(p - expected[node][state]) < 1e-5
+
+    pickle.dumps(bn)
+    samples = parallel_sample(bn, evidence=evidence, n_samples=200, n_workers=2, seed=0)
+    assert all(len(codes) == 200 for codes in samples.values())
+
+
+@pytest.mark.parametrize('build', [build_eurozone_crisis_network, build_trump_tariffs_network])
+def test_log_joint_probability_matches_joint_probability(build):
+    """Both networks score a {node: state} assignment; the probability is exp of the log."""
+    bn = build()
+    assignment = {node: bn.states[node][0] for node in bn.graph.nodes}
+    logp = bn._log_joint_probability(assignment)
+    assert abs(math.exp(logp) - bn._calculate_joint_probability(assignment)) < 1e-12
+    assert bn._log_joint_probability({}) == -math.inf
+
+
+def test_posteriors_are_python_floats():
+    """Every inference path returns plain floats, not numpy float32."""
+    ez = build_eurozone_crisis_network()
+    tt = build_trump_tariffs_network()
+    for results in (ez.get_probability({}),
+                    ez.get_probability({'Political_Instability': 'High'}),
+                    ez.codegen()({'Political_Instability': 'High'}),
+                    tt.get_probability({}),
+                    tt.get_probability({'Inflation_Surge': 'Significant'}),
+                    tt.compile_query(('Tariff_Policy',))(1)):
+        for probs in results.values():
+            assert all(type(p) is float for p in probs.values())
+
+
+def test_tariff_posterior_cache_survives_pickle_and_deepcopy():
+    """Memoized posteriors are plain data: pickled with the network, not shared by copies."""
+    bn = build_trump_tariffs_network()
+    evidence = {'Tariff_Policy': 'Aggressive'}
+    expected = bn.get_probability(evidence)
+
+    assert pickle.loads(pickle.dumps(bn)).get_probability(evidence) == expected
+
+    prior = bn.get_probability({})
+    clone = copy.deepcopy(bn)
+    clone.set_cpd('Tariff_Policy', np.array([0.9, 0.1]))
+    assert clone.get_probability({}) != prior
+    assert bn.get_probability({}) == prior
+
+
+def test_tariff_posterior_cache_is_bounded(monkeypatch):
+    """get_probability() keeps only the most recently used evidence sets."""
+    monkeypatch.setattr(trump_tariffs_2025_blackswan, 'POSTERIOR_CACHE_SIZE', 2)
+    bn = build_trump_tariffs_network()
+    a, b, c = ({'Tariff_Policy': 'Aggressive'}, {'China_Response': 'Strong'},
+               {'Inflation_Surge': 'Significant'})
+    for evidence in (a, b, a, c):
+        bn.get_probability(evidence)
+    assert list(bn._posteriors) == [tuple(sorted(a.items())), tuple(sorted(c.items()))]
+
+
+def test_compile_query_keeps_network_picklable():
+    """Compiled queries are dropped when pickling or copying and rebuilt on demand."""
+    bn = build_trump_tariffs_network()
+    expected = bn.compile_query(('Tariff_Policy',))(1)
+
+    clone = pickle.loads(pickle.dumps(bn))
+    assert clone.compile_query(('Tariff_Policy',))(1) == expected
+    assert copy.deepcopy(bn).compile_query(('Tariff_Policy',)) is not bn.compile_query(('Tariff_Policy',))
+
+
+def test_sample_counts_weights_non_root_evidence():
+    """Evidence below the roots is weighted by default and refused unweighted."""
+    bn = build_trump_tariffs_network()
+    evidence = {'Inflation_Surge': 'Significant'}
+    # Rejection sampling as the reference (sampling normalizes the CPD columns)
+    samples = bn.sample(n_samples=100000, seed=1)
+    expected = samples['Trade_War_Escalation'][samples['Inflation_Surge'] == 1].mean()
+
+    counts = bn.sample_counts(evidence=evidence, n_samples=20000, seed=0)
+    assert abs(counts['Trade_War_Escalation'][1] / 20000 - expected) < 0.02
+
+    with pytest.raises(ValueError):
+        bn.sample_counts(evidence=evidence, weighted=False)
+    assert bn.sample_counts(evidence={'Tariff_Policy': 'Aggressive'}, weighted=False)['Tariff_Policy'][1] == 1000
+
+
+class _ExtremeUniforms:
+    """Stand-in for np.random.default_rng() that only draws u = 0 or the largest float32 below 1."""
+
+    def __init__(self, seed=None):
+        self.calls = 0
+
+    def random(self, size, dtype=np.float64):
+        self.calls += 1
+        value = 0.0 if self.calls % 2 else np.nextafter(np.float32(1), np.float32(0))
+        return np.full(size, value, dtype=dtype)
+
+
+def test_sample_never_draws_zero_probability_states(monkeypatch):
+    """Inverse-CDF sampling must not land on impossible states at either end of [0, 1)."""
+    monkeypatch.setattr(np.random, 'default_rng', _ExtremeUniforms)
+    bn = BayesianNetwork()
+    bn.add_node('A', ['a0', 'a1'])
+    bn.add_node('B', ['b0', 'b1', 'b2', 'b3'])
+    bn.add_edge('A', 'B')
+    bn.set_cpd('A', np.array([0.0, 1.0]))
+    bn.set_cpd('B', np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [0.0, 0.0]]), ['A'])
+    # float32 cumsum of this prior tops out at the largest uniform, below 1
+    bn.add_node('C', ['c0', 'c1', 'c2', 'c3'])
+    bn.set_cpd('C', np.array([0.20381899, 0.7463113, 0.04986968, 0.0]))
+    for _ in range(2):
+        samples = bn.sample(n_samples=10)
+        assert (samples['A'] == 1).all()
+        assert (samples['B'] == 2).all()
+        assert (samples['C'] != 3).all()
+
+
+# Small diamond A -> B, C -> D with zero entries: A = a1 is impossible, and
+# so is D = d1 whenever C = c0
+DIAMOND_STATES = {'A': ['a0', 'a1'], 'B': ['b0', 'b1', 'b2'], 'C': ['c0', 'c1'], 'D': ['d0', 'd1']}
+DIAMOND_CPDS = {
+    'A': (np.array([1.0, 0.0]), []),
+    'B': (np.array([[0.2, 0.5], [0.0, 0.5], [0.8, 0.0]]), ['A']),
+    'C': (np.array([[0.3, 0.9], [0.7, 0.1]]), ['A']),
+    'D': (np.array([[[1.0, 0.4], [0.6, 0.5], [1.0, 0.2]],
+                    [[0.0, 0.6], [0.4, 0.5], [0.0, 0.8]]]), ['B', 'C']),
+}
+
+
+def _diamond(cls):
+    bn = cls()
+    for node, states in DIAMOND_STATES.items():
+        bn.add_node(node, states)
+    for node, (cpd, parents) in DIAMOND_CPDS.items():
+        for parent in parents:
+            bn.add_edge(parent, node)
+        bn.set_cpd(node, cpd, parents)
+    return bn
+
+
+def _enumerate(evidence):
+    """Posterior marginals by summing the full joint (all zeros if the evidence is impossible)."""
+    nodes = list(DIAMOND_STATES)
+    totals = {node: np.zeros(len(DIAMOND_STATES[node])) for node in nodes if node not in evidence}
+    for codes in itertools.product(*[range(len(DIAMOND_STATES[n])) for n in nodes]):
+        assignment = dict(zip(nodes, codes))
+        if any(DIAMOND_STATES[n][assignment[n]] != state for n, state in evidence.items()):
+            continue
+        p = 1.0
+        for node, (cpd, parents) in DIAMOND_CPDS.items():
+            p *= cpd[(assignment[node],) + tuple(assignment[q] for q in parents)]
+        for node, total in totals.items():
+            total[assignment[node]] += p
+    return {node: total / total.sum() if total.sum() > 0 else total for node, total in totals.items()}
+
+
+def _all_evidence():
+    """Every partial assignment of the diamond's nodes, including the empty one."""
+    options = [[None] + states for states in DIAMOND_STATES.values()]
+    for choice in itertools.product(*options):
+        yield {node: state for node, state in zip(DIAMOND_STATES, choice) if state is not None}
+
+
+def _assert_matches(results, expected):
+    assert set(results) == set(expected)
+    for node, probs in results.items():
+        assert np.allclose([probs[s] for s in DIAMOND_STATES[node]], expected[node], atol=1e-6)
+
+
+def test_exact_inference_matches_enumeration():
+    """Junction tree, direct-column shortcut, codegen() and compile_query() agree with brute force."""
+    ez, tt = _diamond(BayesianNetwork), _diamond(TrumpTariffsBayesianNetwork)
+    infer = ez.codegen()
+    for evidence in _all_evidence():
+        expected = _enumerate(evidence)
+        _assert_matches(ez.get_probability(evidence), expected)
+        _assert_matches(infer(evidence), expected)
+        _assert_matches(tt.get_probability(evidence), expected)
+        keys = tuple(evidence)
+        codes = [DIAMOND_STATES[node].index(state) for node, state in evidence.items()]
+        _assert_matches(tt.compile_query(keys)(*codes), expected)
@@ -15,9 +15,71 @@ Key features:
 
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from typing import Dict, List
-from itertools import product
+from typing import Callable, Dict, List, Tuple
+from collections import OrderedDict
+
+from _bn_common import EINSUM_LABELS, GOT_NUMBA, JunctionTree, njit, prange
+
+# Optional Cython build of the joint-probability kernel (see _bn_kernel.pyx)
+try:
+    from _bn_kernel import joint_prob as _joint_prob_c
+    GOT_BN_KERNEL = True
+except ImportError:
+    GOT_BN_KERNEL = False
+
+# Evidence sets whose posteriors get_probability() keeps (least recently used dropped)
+POSTERIOR_CACHE_SIZE = 256
+
+
+@njit(cache=True)
+def _joint_prob_nb(assign, order, cpd_flat, cpd_offsets, node_strides,
+                   parent_ptr, parent_ids, parent_strides):
+    """
+    Product of the CPD entries selected by an integer-coded assignment.
+    
+    node_strides[n] is the element stride of node n's own axis in its
+    C-ordered table; its parents are the CSR slice
+    parent_ptr[n]:parent_ptr[n + 1] of parent_ids/parent_strides, so each
+    factor is one flat lookup.
+    """
+    prob = 1.0
+    for n in order:
+        off = cpd_offsets[n] + node_strides[n] * assign[n]
+        for j in range(parent_ptr[n], parent_ptr[n + 1]):
+            off += parent_strides[j] * assign[parent_ids[j]]
+        prob *= cpd_flat[off]
+    return prob
+
+
+@njit(parallel=True, cache=True)
+def _sample_nb(draws, weights, u, observed, order, cdf_flat, cdf_offsets, n_states,
+               parent_ptr, parent_ids, parent_strides):
+    """
+    Fill draws (nodes x samples, observed rows pre-set) by inverse CDF.
+    
+    Samples are independent, so they are spread over threads with prange;
+    each walks the nodes in topological order. cdf_flat holds one
+    contiguous CDF of length n_states[n] per parent combination of node n.
+    Observed nodes are not drawn; their likelihood is multiplied into
+    the sample's weight instead.
+    """
+    for s in prange(draws.shape[1]):
+        for n in order:
+            column = 0
+            for j in range(parent_ptr[n], parent_ptr[n + 1]):
+                column += parent_strides[j] * draws[parent_ids[j], s]
+            base = cdf_offsets[n] + column * n_states[n]
+            if observed[n]:
+                state = draws[n, s]
+                likelihood = cdf_flat[base + state]
+                if state > 0:
+                    likelihood -= cdf_flat[base + state - 1]
+                weights[s] *= likelihood
+                continue
+            state = 0
+            while state < n_states[n] - 1 and cdf_flat[base + state] <= u[n, s]:
+                state += 1
+            draws[n, s] = state
 
 
 class TrumpTariffsBayesianNetwork:
@@ -32,121 +94,319 @@ class TrumpTariffsBayesianNetwork:
         self.graph = nx.DiGraph()
         self.cpds = {}
         self.states = {}
+        self._dirty = True  # Structure changed since the last _finalize()
         
+    def __getstate__(self):
+        """Pickle (and deepcopy) without the compile_query() closures."""
+        state = self.__dict__.copy()
+        state.pop('_compiled_queries', None)
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a pickled network with an empty compile_query() cache."""
+        self.__dict__.update(state)
+        self._compiled_queries = {}
+    
     def add_node(self, node: str, states: List[str]):
         """Add a node with its possible states."""
         self.graph.add_node(node)
         self.states[node] = states
+        self._dirty = True
         
     def add_edge(self, parent: str, child: str):
         """Add a causal edge from parent to child."""
         self.graph.add_edge(parent, child)
+        self._dirty = True
         
     def set_cpd(self, node: str, cpd: np.ndarray, parent_order: List[str] = None):
-        """Set conditional probability distribution."""
+        """
+        Set conditional probability distribution, a C-contiguous table with
+        axes (node, *parent_order); stored as float32.
+        """
+        cpd = np.asarray(cpd)
+        if not cpd.flags['C_CONTIGUOUS']:
+            raise ValueError(f"CPD for {node} is not C-contiguous; write it in "
+                             f"(node, *parents) axis order instead of transposing")
+        cpd = cpd.astype(np.float32)
         self.cpds[node] = {
             'table': cpd,
-            'parents': parent_order if parent_order else []
+            'parents': parent_order if parent_order else [],
+            # Flat view and element strides: entry (i, j, ...) is
+            # flat[i * strides[0] + j * strides[1] + ...]
+            'flat': cpd.ravel(order='C'),
+            'strides': np.array(cpd.strides, dtype=np.int64) // cpd.itemsize
+        }
+        self._dirty = True
+    
+    def _finalize(self):
+        """
+        Rebuild the topological codes, sampling CDFs, kernel arrays and
+        junction tree if the network changed.
+        """
+        if not self._dirty:
+            return
+        
+        nodes = self._topo_order = list(nx.topological_sort(self.graph))
+        self._topo_pos = {node: i for i, node in enumerate(nodes)}
+        self._state_to_int = {node: {state: i for i, state in enumerate(self.states[node])}
+                              for node in nodes}
+        
+        # Parents in CSR form: node i's CPD parents (as topological positions)
+        # are self._parent_ids[self._parent_ptr[i]:self._parent_ptr[i + 1]]
+        parents = [[self._topo_pos[p] for p in self.cpds[node]['parents']] for node in nodes]
+        self._parent_ptr = np.cumsum([0] + [len(p) for p in parents]).astype(np.int32)
+        self._parent_ids = np.array([p for ps in parents for p in ps], dtype=np.int32)
+        
+        self._pmf, self._cdf = {}, {}
+        for node in nodes:
+            table = np.asarray(self.cpds[node]['table'], dtype=float)
+            
+            # One column per parent combination, normalized (uniform if empty)
+            k = table.shape[0]
+            columns = table.reshape(k, -1)
+            totals = columns.sum(axis=0)
+            columns = np.where(totals > 0, columns / np.where(totals > 0, totals, 1.0), 1.0 / k)
+            cdf = np.cumsum(columns, axis=0)
+            cdf[-1] = 1.0
+            self._pmf[node], self._cdf[node] = columns, cdf
+        
+        # Flat arrays for the compiled kernels, indexed by topological position
+        flats = [self.cpds[node]['flat'] for node in nodes]
+        strides = [self.cpds[node]['strides'] for node in nodes]
+        cdfs = [np.ascontiguousarray(self._cdf[node].T) for node in nodes]
+        self._kernel_args = {
+            'order': np.arange(len(nodes), dtype=np.int64),
+            'cpd_flat': np.concatenate(flats).astype(np.float64),
+            'cpd_offsets': np.cumsum([0] + [f.size for f in flats[:-1]]).astype(np.int64),
+            'node_strides': np.array([st[0] for st in strides], dtype=np.int64),
+            'parent_ptr': self._parent_ptr,
+            'parent_ids': self._parent_ids,
+            'parent_strides': np.concatenate([st[1:] for st in strides]),
+            'cdf_flat': np.concatenate([c.ravel() for c in cdfs]),
+            'cdf_offsets': np.cumsum([0] + [c.size for c in cdfs[:-1]]).astype(np.int64),
+            'n_states': np.array([len(self.states[node]) for node in nodes], dtype=np.int64),
         }
+        
+        self._posteriors = OrderedDict()  # LRU cache of get_probability() results
+        self._compiled_queries = {}  # evidence_keys -> compile_query() result
+        self._junction_tree = JunctionTree(self.graph, self.cpds, self.states, self._topo_pos,
+                                           dtype=np.float32)
+        self._dirty = False
     
     def get_probability(self, evidence: Dict[str, str]) -> Dict[str, Dict[str, float]]:
-        """Calculate probabilities given evidence using variable elimination."""
+        """
+        Calculate probabilities given evidence using variable elimination.
+        
+        The last POSTERIOR_CACHE_SIZE results are kept; callers get copies.
+        """
+        self._finalize()
+        key = tuple(sorted(evidence.items()))
+        if key in self._posteriors:
+            self._posteriors.move_to_end(key)
+        else:
+            self._posteriors[key] = self._query(key)
+            if len(self._posteriors) > POSTERIOR_CACHE_SIZE:
+                self._posteriors.popitem(last=False)
+        return {node: dict(probs) for node, probs in self._posteriors[key].items()}
+    
+    def _query(self, evidence_items: tuple) -> Dict[str, Dict[str, float]]:
+        """Posterior marginals of every hidden node from one junction-tree propagation."""
+        evidence = dict(evidence_items)
         results = {}
         hidden_nodes = [n for n in self.graph.nodes() if n not in evidence]
         
+        beliefs = self._junction_tree.propagate({node: self._state_to_int[node][state]
+                                                 for node, state in evidence.items()})
         for query_node in hidden_nodes:
-            probs = {}
-            
-            for query_state in self.states[query_node]:
-                total_prob = 0.0
-                other_hidden = [n for n in hidden_nodes if n != query_node]
-                
-                if not other_hidden:
-                    assignment = {**evidence, query_node: query_state}
-                    total_prob = self._calculate_joint_probability(assignment)
-                else:
-                    other_states = [self.states[n] for n in other_hidden]
-                    for state_combo in product(*other_states):
-                        assignment = {**evidence, query_node: query_state}
-                        for i, node in enumerate(other_hidden):
-                            assignment[node] = state_combo[i]
-                        total_prob += self._calculate_joint_probability(assignment)
-                
-                probs[query_state] = total_prob
+            probs = self._junction_tree.marginal(beliefs, query_node)
             
             # Normalize
-            total = sum(probs.values())
+            total = probs.sum()
             if total > 0:
-                probs = {k: v/total for k, v in probs.items()}
-            results[query_node] = probs
+                probs = probs / total
+            results[query_node] = {state: float(probs[i]) for i, state in enumerate(self.states[query_node])}
             
         return results
     
-    def _calculate_joint_probability(self, assignment: Dict[str, str]) -> float:
-        """Calculate joint probability of complete assignment."""
-        prob = 1.0
+    def compile_query(self, evidence_keys: Tuple[str, ...]) -> Callable[..., Dict[str, Dict[str, float]]]:
+        """
+        Inference function for a fixed set of observed nodes, taking their
+        state indices, e.g. compile_query(('Tariff_Policy', 'China_Response'))(1, 1).
+        """
+        self._finalize()
+        evidence_keys = tuple(evidence_keys)
+        if evidence_keys in self._compiled_queries:
+            return self._compiled_queries[evidence_keys]
         
-        for node in nx.topological_sort(self.graph):
-            if node not in assignment:
-                return 0.0
-                
-            parents = list(self.graph.predecessors(node))
-            
-            if not parents:
-                cpd = self.cpds[node]['table']
-                node_state_idx = self.states[node].index(assignment[node])
-                prob *= cpd[node_state_idx]
-            else:
-                cpd = self.cpds[node]['table']
-                node_state_idx = self.states[node].index(assignment[node])
-                parent_indices = [self.states[p].index(assignment[p]) 
-                                for p in self.cpds[node]['parents']]
-                index = [node_state_idx] + parent_indices
-                prob *= cpd[tuple(index)]
-                
-        return prob
+        nodes = list(self.graph.nodes())
+        hidden_nodes = [n for n in nodes if n not in evidence_keys]
+        
+        # Per CPD: subscripts of its unobserved axes, and (axis, key position)
+        # for each observed one
+        subscripts, fixed = [], []
+        for node in nodes:
+            variables = [node] + self.cpds[node]['parents']
+            subscripts.append(''.join(EINSUM_LABELS[self._topo_pos[v]]
+                                      for v in variables if v not in evidence_keys))
+            fixed.append([(axis, evidence_keys.index(v)) for axis, v in enumerate(variables)
+                          if v in evidence_keys])
+        tables = [self.cpds[node]['table'] for node in nodes]
+        
+        def operands(indices):
+            arrays = []
+            for table, fixed_axes in zip(tables, fixed):
+                index = [slice(None)] * table.ndim
+                for axis, k in fixed_axes:
+                    index[axis] = indices[k]
+                arrays.append(table[tuple(index)])
+            return arrays
+        
+        placeholder = operands((0,) * len(evidence_keys))
+        programs = []
+        for query_node in hidden_nodes:
+            expr = ','.join(subscripts) + '->' + EINSUM_LABELS[self._topo_pos[query_node]]
+            path = np.einsum_path(expr, *placeholder, optimize='greedy')[0]
+            programs.append((query_node, expr, path))
+        
+        def query(*indices):
+            arrays = operands(indices)
+            results = {}
+            for query_node, expr, path in programs:
+                probs = np.einsum(expr, *arrays, optimize=path)
+                total = probs.sum()
+                if total > 0:
+                    probs = probs / total
+                results[query_node] = {state: float(probs[i])
+                                       for i, state in enumerate(self.states[query_node])}
+            return results
+        
+        query.__name__ = '_'.join(['marginals_given'] + [key.replace('_', '') for key in evidence_keys])
+        self._compiled_queries[evidence_keys] = query
+        return query
     
-    def sample(self, evidence: Dict[str, str] = None, n_samples: int = 1000):
-        """Forward sampling from the network."""
-        samples = {node: [] for node in self.graph.nodes()}
+    def _calculate_joint_probability(self, assignment: Dict[str, str]) -> float:
+        """
+        Calculate joint probability of a complete assignment (0.0 if incomplete).
         
-        for _ in range(n_samples):
-            assignment = evidence.copy() if evidence else {}
-            
-            for node in nx.topological_sort(self.graph):
-                if node in assignment:
-                    samples[node].append(assignment[node])
-                    continue
-                    
-                parents = list(self.graph.predecessors(node))
-                
-                if not parents:
-                    probs = self.cpds[node]['table']
-                    state = np.random.choice(self.states[node], p=probs)
-                else:
-                    parent_states = [assignment[p] for p in self.cpds[node]['parents']]
-                    parent_indices = [self.states[p].index(parent_states[i]) 
-                                    for i, p in enumerate(self.cpds[node]['parents'])]
-                    
-                    cpd = self.cpds[node]['table']
-                    index = [slice(None)] + parent_indices
-                    cond_probs = cpd[tuple(index)]
-                    cond_probs = np.array(cond_probs).flatten()
-                    
-                    if cond_probs.sum() > 0:
-                        cond_probs = cond_probs / cond_probs.sum()
-                    else:
-                        cond_probs = np.ones(len(self.states[node])) / len(self.states[node])
-                    
-                    state = np.random.choice(self.states[node], p=cond_probs)
+        Runs in the Cython extension when it has been built (GOT_BN_KERNEL),
+        otherwise in _joint_prob_nb.
+        """
+        codes = self._assignment_codes(assignment)
+        if codes is None:
+            return 0.0
+        args = self._kernel_args
+        kernel = _joint_prob_c if GOT_BN_KERNEL else _joint_prob_nb
+        return float(kernel(codes, args['order'],
+                            args['cpd_flat'], args['cpd_offsets'], args['node_strides'],
+                            args['parent_ptr'], args['parent_ids'], args['parent_strides']))
+    
+    def _log_joint_probability(self, assignment: Dict[str, str]) -> float:
+        """Log joint probability of a complete assignment (-inf if impossible or incomplete)."""
+        codes = self._assignment_codes(assignment)
+        if codes is None:
+            return -np.inf
+        args = self._kernel_args
+        owner = np.repeat(np.arange(len(codes)), np.diff(args['parent_ptr']))
+        parent_terms = np.bincount(owner, weights=args['parent_strides'] * codes[args['parent_ids']],
+                                   minlength=len(codes)).astype(np.int64)
+        offsets = args['cpd_offsets'] + args['node_strides'] * codes + parent_terms
+        with np.errstate(divide='ignore'):
+            return float(np.log(args['cpd_flat'][offsets]).sum())
+    
+    def _assignment_codes(self, assignment: Dict[str, str]) -> np.ndarray:
+        """State codes of a complete assignment in topological order (None if incomplete)."""
+        self._finalize()
+        if any(node not in assignment for node in self._topo_order):
+            return None
+        return np.array([self._state_to_int[node][assignment[node]] for node in self._topo_order],
+                        dtype=np.int64)
+    
+    def _forward_sample(self, evidence: Dict[str, str], n_samples: int,
+                        rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Likelihood-weighted forward sampling: int8 state codes (row
+        self._topo_pos[node] per node) and the per-sample weights.
+        """
+        self._finalize()
+        observed = {node: self._state_to_int[node][state] for node, state in (evidence or {}).items()}
+        draws = np.empty((len(self._topo_order), n_samples), dtype=np.int8)
+        weights = np.ones(n_samples)
+        u = rng.random(draws.shape, dtype=np.float32)
+        
+        if GOT_NUMBA:
+            is_observed = np.zeros(len(self._topo_order), dtype=np.bool_)
+            for node, code in observed.items():
+                draws[self._topo_pos[node]] = code
+                is_observed[self._topo_pos[node]] = True
+            args = self._kernel_args
+            _sample_nb(draws, weights, u, is_observed, args['order'],
+                       args['cdf_flat'], args['cdf_offsets'], args['n_states'],
+                       args['parent_ptr'], args['parent_ids'], args['parent_strides'])
+        else:
+            parent_strides = self._kernel_args['parent_strides']
+            for i, node in enumerate(self._topo_order):
+                column = np.zeros(n_samples, dtype=np.intp)
+                for j in range(self._parent_ptr[i], self._parent_ptr[i + 1]):
+                    column += parent_strides[j] * draws[self._parent_ids[j]]
                 
-                assignment[node] = state
-                samples[node].append(state)
+                if node in observed:
+                    draws[i] = observed[node]
+                    weights *= self._pmf[node][observed[node], column]
+                    continue
                 
-        return samples
+                draws[i] = (self._cdf[node][:, column] > u[i]).argmax(axis=0)
+        
+        return draws, weights
+    
+    def sample(self, evidence: Dict[str, str] = None, n_samples: int = 1000,
+               return_weights: bool = False, seed: int = None):
+        """Forward sampling from the network, as int8 codes into self.states[node]."""
+        draws, weights = self._forward_sample(evidence, n_samples, np.random.default_rng(seed))
+        samples = {node: draws[self._topo_pos[node]] for node in self.graph.nodes()}
+        return (samples, weights) if return_weights else samples
+    
+    def sample_counts(self, evidence: Dict[str, str] = None, n_samples: int = 1000,
+                      seed: int = None, weighted: bool = None,
+                      chunk_size: int = 100_000) -> Dict[str, np.ndarray]:
+        """
+        Per-node state counts of n_samples forward samples, drawn in chunks.
+        
+        Weighted (scaled to n_samples) by default whenever there is evidence.
+        """
+        evidence = evidence or {}
+        if weighted is None:
+            weighted = bool(evidence)
+        elif not weighted:
+            non_root = [node for node in evidence if self.cpds[node]['parents']]
+            if non_root:
+                raise ValueError(f"Evidence on non-root nodes {non_root} needs weighted=True; "
+                                 f"unweighted counts would ignore the evidence likelihood")
+        rng = np.random.default_rng(seed)
+        dtype = np.float64 if weighted else np.int64
+        counts = {node: np.zeros(len(self.states[node]), dtype=dtype) for node in self.graph.nodes()}
+        total_weight = 0.0
+        
+        for start in range(0, n_samples, chunk_size):
+            draws, weights = self._forward_sample(evidence, min(chunk_size, n_samples - start), rng)
+            total_weight += weights.sum()
+            for node, tally in counts.items():
+                tally += np.bincount(draws[self._topo_pos[node]], weights=weights if weighted else None,
+                                     minlength=len(tally)).astype(dtype)
+        
+        if weighted and total_weight > 0:
+            for tally in counts.values():
+                tally *= n_samples / total_weight
+        return counts
     
     def visualize(self, filename: str = None):
-        """Visualize the network structure."""
+        """
+        Visualize the network structure.
+        
+        matplotlib is imported here rather than at module level, so code that
+        only builds and queries the network never pays for loading it.
+        """
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(16, 10))
         
         # Hierarchical layout
@@ -284,32 +544,32 @@ def build_trump_tariffs_network() -> TrumpTariffsBayesianNetwork:
     
     # P(Supply_Chain_Disruption | Trade_War_Escalation)
     supply_cpd = np.array([
-        [0.85, 0.20],  # [Minor, Major] | Contained
-        [0.15, 0.80]   # [Minor, Major] | Severe
+        [0.85, 0.15],  # Minor | Escalation = Contained, Severe
+        [0.20, 0.80]   # Major | Escalation = Contained, Severe
     ])
-    bn.set_cpd('Supply_Chain_Disruption', supply_cpd.T, ['Trade_War_Escalation'])
+    bn.set_cpd('Supply_Chain_Disruption', supply_cpd, ['Trade_War_Escalation'])
     
     # P(Inflation_Surge | Trade_War_Escalation)
     inflation_cpd = np.array([
-        [0.75, 0.25],  # [Modest, Significant] | Contained
-        [0.25, 0.75]   # [Modest, Significant] | Severe
+        [0.75, 0.25],  # Modest      | Escalation = Contained, Severe
+        [0.25, 0.75]   # Significant | Escalation = Contained, Severe
     ])
-    bn.set_cpd('Inflation_Surge', inflation_cpd.T, ['Trade_War_Escalation'])
+    bn.set_cpd('Inflation_Surge', inflation_cpd, ['Trade_War_Escalation'])
     
     # P(Dollar_Strength | Trade_War_Escalation)
     # Safe haven + repatriation vs trade deficit concerns
     dollar_cpd = np.array([
-        [0.60, 0.45],  # [Stable, Strengthening] | Contained
-        [0.40, 0.55]   # [Stable, Strengthening] | Severe
+        [0.60, 0.40],  # Stable        | Escalation = Contained, Severe
+        [0.45, 0.55]   # Strengthening | Escalation = Contained, Severe
     ])
-    bn.set_cpd('Dollar_Strength', dollar_cpd.T, ['Trade_War_Escalation'])
+    bn.set_cpd('Dollar_Strength', dollar_cpd, ['Trade_War_Escalation'])
     
     # P(Fed_Policy | Inflation_Surge)
     fed_cpd = np.array([
-        [0.70, 0.20],  # [Accommodative, Hawkish] | Modest inflation
-        [0.30, 0.80]   # [Accommodative, Hawkish] | Significant inflation
+        [0.70, 0.30],  # Accommodative | Inflation = Modest, Significant
+        [0.20, 0.80]   # Hawkish       | Inflation = Modest, Significant
     ])
-    bn.set_cpd('Fed_Policy', fed_cpd.T, ['Inflation_Surge'])
+    bn.set_cpd('Fed_Policy', fed_cpd, ['Inflation_Surge'])
     
     # P(Treasury_Yields | Fed_Policy, Inflation_Surge)
     yields_cpd = np.zeros((2, 2, 2))
@@ -332,38 +592,38 @@ def build_trump_tariffs_network() -> TrumpTariffsBayesianNetwork:
     
     # P(Manufacturing | Supply_Chain_Disruption)
     manuf_cpd = np.array([
-        [0.85, 0.30],  # [Resilient, Stressed] | Minor disruption
-        [0.15, 0.70]   # [Resilient, Stressed] | Major disruption
+        [0.85, 0.15],  # Resilient | Disruption = Minor, Major
+        [0.30, 0.70]   # Stressed  | Disruption = Minor, Major
     ])
-    bn.set_cpd('Manufacturing', manuf_cpd.T, ['Supply_Chain_Disruption'])
+    bn.set_cpd('Manufacturing', manuf_cpd, ['Supply_Chain_Disruption'])
     
     # P(Consumer_Discretionary | Inflation_Surge)
     consumer_cpd = np.array([
-        [0.75, 0.30],  # [Stable, Weak] | Modest inflation
-        [0.25, 0.70]   # [Stable, Weak] | Significant inflation
+        [0.75, 0.25],  # Stable | Inflation = Modest, Significant
+        [0.30, 0.70]   # Weak   | Inflation = Modest, Significant
     ])
-    bn.set_cpd('Consumer_Discretionary', consumer_cpd.T, ['Inflation_Surge'])
+    bn.set_cpd('Consumer_Discretionary', consumer_cpd, ['Inflation_Surge'])
     
     # P(Multinationals | Dollar_Strength)
     multi_cpd = np.array([
-        [0.80, 0.40],  # [Stable, Pressured] | Dollar Stable
-        [0.20, 0.60]   # [Stable, Pressured] | Dollar Strengthening
+        [0.80, 0.20],  # Stable    | Dollar = Stable, Strengthening
+        [0.40, 0.60]   # Pressured | Dollar = Stable, Strengthening
     ])
-    bn.set_cpd('Multinationals', multi_cpd.T, ['Dollar_Strength'])
+    bn.set_cpd('Multinationals', multi_cpd, ['Dollar_Strength'])
     
     # P(Tech_Sector | Treasury_Yields)
     tech_cpd = np.array([
-        [0.75, 0.35],  # [Strong, Weak] | Low yields
-        [0.25, 0.65]   # [Strong, Weak] | Rising yields
+        [0.75, 0.25],  # Strong | Yields = Low, Rising
+        [0.35, 0.65]   # Weak   | Yields = Low, Rising
     ])
-    bn.set_cpd('Tech_Sector', tech_cpd.T, ['Treasury_Yields'])
+    bn.set_cpd('Tech_Sector', tech_cpd, ['Treasury_Yields'])
     
     # P(REITs | Treasury_Yields)
     reits_cpd = np.array([
-        [0.80, 0.30],  # [Stable, Declining] | Low yields
-        [0.20, 0.70]   # [Stable, Declining] | Rising yields
+        [0.80, 0.20],  # Stable    | Yields = Low, Rising
+        [0.30, 0.70]   # Declining | Yields = Low, Rising
     ])
-    bn.set_cpd('REITs', reits_cpd.T, ['Treasury_Yields'])
+    bn.set_cpd('REITs', reits_cpd, ['Treasury_Yields'])
     
     return bn
 
@@ -540,7 +800,7 @@ def main():
     print("=" * 90)
     print()
     
-    samples = bn.sample(
+    counts = bn.sample_counts(
         evidence={'Tariff_Policy': 'Aggressive', 'China_Response': 'Strong'},
         n_samples=10000
     )
@@ -553,10 +813,9 @@ def main():
     
     for var in critical_vars:
         print(f"\n{var}:")
-        for state in bn.states[var]:
-            count = samples[var].count(state)
+        for state, count in zip(bn.states[var], counts[var]):
             prob = count / 10000
-            print(f"  {state}: {prob:.1%} ({count:,} occurrences)")
+            print(f"  {state}: {prob:.1%} ({count:,.0f} occurrences)")
     
     print("\n" + "=" * 90)
     print("KEY TAKEAWAY: 2025 Tariff Risk is REAL and UNDERPRICED")